@@ -1,4 +1,5 @@
 from collections import OrderedDict
+import asyncio
 import functools
 import inspect
 import logging
@@ -79,12 +80,34 @@ def async_cache_result(
                 )
             )
 
+        # Concurrent misses for the same key share a single computation
+        inflight: dict[str, asyncio.Task] = {}
+
+        async def compute_and_store(key: str, *args, **kwargs):
+            result = func(*args, **kwargs)
+            # Check if the result is an instance of Awaitable
+            if inspect.isawaitable(result):
+                data = await result
+            else:
+                # If not awaitable, just return the result
+                data = result
+            if predicate(data):
+                cache_entry = Cache(
+                    key=key,
+                    value=result_serializer(data),
+                    timestamp=datetime.now(timezone.utc),
+                )
+                async with make_async_session() as session:
+                    await session.merge(cache_entry)
+                    await session.commit()
+            return data
+
         @functools.wraps(func)
         async def wrapper(*args, allow_cache=True, **kwargs):
             key = get_key(func, argument_serializers, *args, **kwargs)
 
-            async with make_async_session() as session:
-                if allow_cache:
+            if allow_cache:
+                async with make_async_session() as session:
                     # Try to load from cache
                     result = await session.scalar(select(Cache).where(Cache.key == key))
                     if result:
@@ -101,23 +124,14 @@ def async_cache_result(
                             await session.delete(result)
                             await session.commit()
 
-                # Miss or expired, compute and cache it
-                result = func(*args, **kwargs)
-                # Check if the result is an instance of Awaitable
-                if inspect.isawaitable(result):
-                    data = await result
-                else:
-                    # If not awaitable, just return the result
-                    data = result
-                if predicate(data):
-                    cache_entry = Cache(
-                        key=key,
-                        value=result_serializer(data),
-                        timestamp=datetime.now(timezone.utc),
-                    )
-                    await session.merge(cache_entry)
-                    await session.commit()
-                return data
+            # Miss or expired, compute and cache it (or join a computation in flight)
+            task = inflight.get(key)
+            if task is None:
+                task = asyncio.ensure_future(compute_and_store(key, *args, **kwargs))
+                inflight[key] = task
+                task.add_done_callback(lambda _: inflight.pop(key, None))
+            # Shielded so one cancelled caller does not cancel the shared work
+            return await asyncio.shield(task)
 
         return wrapper
 
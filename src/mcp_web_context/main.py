@@ -1,3 +1,4 @@
+import asyncio
 from contextlib import asynccontextmanager, AsyncExitStack
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -9,8 +10,10 @@ import os
 import yaml
 
 from .cache import initialize_cache, shutdown_cache
+from .middleware import TextGZipMiddleware
 from .routers import scraping, search, logs, agent
 from .scraper import scraper_context_manager, Scraper
+from .search import GoogleSearch
 from .services import service_locator
 from .mcp_server import create_mcp
 
@@ -63,11 +66,15 @@ async def lifespan(app: FastAPI):
         logger.info("Initializing cache...")
         await initialize_cache()
         stack.push_async_callback(shutdown_cache)
+        stack.push_async_callback(GoogleSearch.close_session)
 
         # Initialize scraper
         logger.info("Initializing scraper...")
         scraper = await stack.enter_async_context(scraper_context_manager())
         service_locator.container.register_singleton(Scraper, scraper)
+        # Launch the browser in the background so the first scrape skips startup
+        warmup_task = asyncio.create_task(scraper.warmup())
+        stack.callback(warmup_task.cancel)
         logger.info("Services registered successfully")
 
         # Initialize MCP server lifespans
@@ -96,16 +103,26 @@ app = FastAPI(
     disable_existing_loggers=False,
 )
 
-origins = ["*"]
+# Comma-separated list; credentials are only allowed for explicit origins, so
+# the default wildcard is a static header that browsers and proxies can cache
+origins = [
+    o.strip() for o in os.getenv("CORS_ORIGINS", "*").split(",") if o.strip()
+] or ["*"]
 
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
-    allow_credentials=True,
+    allow_credentials="*" not in origins,
     allow_methods=["*"],
     allow_headers=["*"],
+    max_age=86400,  # let browsers cache preflight responses for a day
 )
 
+# Compress large text responses such as API results, log views and directory
+# listings. SSE streams (text/event-stream), media and file downloads are left
+# alone so their bytes, Range and ETag handling stay intact.
+app.add_middleware(TextGZipMiddleware, minimum_size=1024, compresslevel=5)
+
 logger = logging.getLogger(__name__)
 
 # Create MCP server instance (shared builder for all transports)
@@ -0,0 +1,47 @@
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder
+from starlette.types import Message, Receive, Scope, Send
+
+# Response types worth compressing: API JSON, HTML pages and other text
+COMPRESSIBLE_CONTENT_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+
+class _TextGZipResponder(GZipResponder):
+    """GZipResponder that passes non-text and ranged responses through untouched"""
+
+    passthrough = False
+
+    async def send_with_compression(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            # FileResponse advertises byte ranges; compressing would break
+            # Range requests and the file's own ETag
+            self.passthrough = "accept-ranges" in headers or not headers.get(
+                "content-type", ""
+            ).startswith(COMPRESSIBLE_CONTENT_TYPES)
+        if self.passthrough:
+            await self.send(message)
+        else:
+            await super().send_with_compression(message)
+
+
+class TextGZipMiddleware(GZipMiddleware):
+    """Compress JSON/HTML/text responses only; media and file downloads are
+    served as-is"""
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and "gzip" in Headers(scope=scope).get(
+            "Accept-Encoding", ""
+        ):
+            responder = _TextGZipResponder(
+                self.app, self.minimum_size, compresslevel=self.compresslevel
+            )
+            await responder(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
@@ -38,7 +38,8 @@ class AgentSearchRequest(BaseModel):
 @router.post(
     "/research",
     summary="Iterative research for comprehensive answers",
-    response_model=FinalAnswer,
+    response_model=None,
+    responses={200: {"model": FinalAnswer}},
 )
 async def agent_websearch(request: AgentSearchRequest) -> FinalAnswer:
     """
@@ -60,7 +61,10 @@ async def agent_websearch(request: AgentSearchRequest) -> FinalAnswer:
 @router.post(
     "/extract",
     summary="AI-powered content extraction and analysis",
-    response_model=ExtractedContent,
+    # Results are already validated models; skip FastAPI's dump/re-validate
+    # round-trip while keeping the schema in the OpenAPI docs.
+    response_model=None,
+    responses={200: {"model": ExtractedContent}},
 )
 async def agent_extract_content(request: AnalyzeRequest) -> ExtractedContent:
     """
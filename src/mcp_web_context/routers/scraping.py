@@ -1,6 +1,8 @@
 import asyncio
 import logging
-from typing import Sequence, Literal
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Sequence, Literal
+from urllib.parse import urlparse
 from fastapi import APIRouter
 from pydantic import BaseModel, Field
 from mcp.server.fastmcp import FastMCP
@@ -58,7 +60,32 @@ class ScrapeResponse(BaseModel):
     )
 
 
-scrape_semaphore = asyncio.Semaphore(20)
+# Per-host limit keeps one slow site from starving the rest; the global limit
+# bounds the total number of browser tabs.
+scrape_semaphore = asyncio.Semaphore(40)
+PER_HOST_SCRAPE_LIMIT = 4
+# Entries live only while some request holds or waits on the host, so the
+# table does not grow with every host ever scraped
+_host_semaphores: dict[str, asyncio.Semaphore] = {}
+_host_users: dict[str, int] = {}
+
+
+@asynccontextmanager
+async def _host_slot(url: str) -> AsyncIterator[None]:
+    host = urlparse(url).netloc
+    semaphore = _host_semaphores.get(host)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(PER_HOST_SCRAPE_LIMIT)
+        _host_semaphores[host] = semaphore
+    _host_users[host] = _host_users.get(host, 0) + 1
+    try:
+        async with semaphore:
+            yield
+    finally:
+        _host_users[host] -= 1
+        if not _host_users[host]:
+            del _host_users[host]
+            del _host_semaphores[host]
 
 
 async def _scrape(
@@ -66,14 +93,16 @@ async def _scrape(
     scraper: Scraper,
     output_format: Literal["text", "markdown", "html"] = "markdown",
 ) -> ScrapeResult:
-    async with scrape_semaphore:
+    # Queue on the host first so waiting for a busy host holds no global slot
+    async with _host_slot(url), scrape_semaphore:
         # Keep fingerprint clean: let the browser handle PDFs/HTML uniformly.
         content, images, title = await scraper.scrape_async(
             url, output_format=output_format
         )
         return ScrapeResult(
             content=content,
-            images=[ScrapeResult.ImageData.model_validate(img) for img in images],
+            # Image dicts are coerced to ImageData in the same validation pass
+            images=images,
             title=title,
         )
 
@@ -99,6 +128,10 @@ async def fetch_web_content(request: ScrapeRequest) -> ScrapeResponse:
     Use as a last resort to get content, since it output excessive content.
     """
     scraper = get_service(Scraper)
+    # Normalize before the cache lookup so "example.com" and "https://example.com"
+    # share an entry, then scrape each distinct URL once and fan results back out
+    urls = [Scraper.normalize_url(url) for url in request.urls]
+    unique_urls = list(dict.fromkeys(urls))
     scrape_results = await asyncio.gather(
         *(
             _scrape_with_cache(
@@ -107,15 +140,18 @@ async def fetch_web_content(request: ScrapeRequest) -> ScrapeResponse:
                 allow_cache=request.allow_cache,
                 output_format=request.output_format,
             )
-            for url in request.urls
+            for url in unique_urls
         )
     )
+    results_by_url = dict(zip(unique_urls, scrape_results))
 
     res: list[ScrapeResult] = []
-    for r in scrape_results:
+    for url in urls:
+        r = results_by_url[url]
         if isinstance(r, ScrapeResult):
             if not request.include_image:
-                r.images = []
+                # Copy: the result object may be shared with other callers
+                r = r.model_copy(update={"images": []})
             res.append(r)
 
     return ScrapeResponse(results=res)
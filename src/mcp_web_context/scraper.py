@@ -1,31 +1,370 @@
-from contextlib import asynccontextmanager, AsyncExitStack
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
+import functools
+import math
+import multiprocessing
 from pathlib import Path
 import random
 import traceback
+import weakref
 from typing_extensions import Literal
 from urllib.parse import urlparse
 from bs4 import BeautifulSoup
-from typing import Any, Dict, cast, Tuple, Optional, AsyncGenerator
+from typing import (
+    Any,
+    AsyncGenerator,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    cast,
+)
 import asyncio
 import logging
 import os
-from patchright.async_api import BrowserContext, Page, Playwright, async_playwright
+import re
+import aiohttp
+from patchright.async_api import (
+    BrowserContext,
+    Page,
+    Playwright,
+    TimeoutError as PlaywrightTimeoutError,
+    async_playwright,
+)
 
 from .utils import (
     get_relevant_images,
     extract_title,
-    get_text_from_soup,
     get_markdown_from_soup,
     clean_soup,
+    parse_html_tree,
+    extract_title_from_tree,
+    get_relevant_images_from_tree,
+    get_text_from_tree,
+)
+
+
+_T = TypeVar("_T")
+
+_pdf_pool: Optional[ProcessPoolExecutor] = None
+_markdown_pool: Optional[ProcessPoolExecutor] = None
+PDF_MAX_WORKERS = min(4, os.cpu_count() or 1)
+# Shorter PDFs are converted by a single worker; splitting costs a re-open per chunk
+PDF_MIN_PAGES_PER_CHUNK = 8
+
+# Empty mount point of a client-rendered app; such pages need the browser
+_SPA_SHELL_RE = re.compile(
+    r'<body[^>]*>\s*<div id="(?:root|app|__next)"[^>]*>\s*</div>', re.IGNORECASE
 )
+# Scrolls in wheel-sized chunks with human-like pacing: each step covers
+# 46-97% of the viewport, stopping at the bottom or after maxPct in total
+_SCROLL_TO_BOTTOM_JS = """
+async (maxPct) => {
+    const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+    const rand = (lo, hi) => lo + Math.random() * (hi - lo);
+    const atBottom = () => {
+        const el = document.scrollingElement || document.documentElement;
+        return window.innerHeight + window.scrollY >= el.scrollHeight;
+    };
+    let totalPct = 0;
+    while (true) {
+        const pct = Math.floor(rand(46, 98));
+        totalPct += pct;
+        const speed = rand(1.0, 1.7);
+        const maxChunk = 120 * speed;
+        let remaining = Math.floor((window.innerHeight * pct) / 100);
+        while (remaining > 0) {
+            const chunk = Math.min(remaining, Math.floor(rand(maxChunk * 0.5, maxChunk)));
+            window.scrollBy(0, chunk + Math.floor(rand(-3, 4)));
+            remaining -= chunk;
+            if (remaining > 0) {
+                await sleep(Math.max(10, 1000 * (0.05 / speed + rand(-0.01, 0.02))));
+            }
+        }
+        await sleep(rand(230, 560));
+        if (totalPct >= maxPct || atBottom()) {
+            break;
+        }
+    }
+}
+"""
+# Enough text already rendered on a page less than 1.5 viewports tall: nothing
+# is left for scrolling to lazy-load
+_SHORT_COMPLETE_PAGE_JS = """
+() => !!document.body
+    && document.body.innerText.length > 4000
+    && document.scrollingElement.scrollHeight <= window.innerHeight * 1.5
+"""
+# Resources the scraper never reads; CSS is kept since layout drives lazy loading
+BLOCKED_RESOURCE_PATTERNS = (
+    "*.png",
+    "*.jpg",
+    "*.jpeg",
+    "*.gif",
+    "*.webp",
+    "*.avif",
+    "*.svg",
+    "*.ico",
+    "*.woff",
+    "*.woff2",
+    "*.ttf",
+    "*.otf",
+    "*.mp4",
+    "*.webm",
+    "*.mp3",
+)
+_DOM_SETTLED_JS = (
+    "() => document.readyState === 'complete'"
+    " && !!document.body && document.body.innerText.length > 200"
+)
+# Serialize a trimmed clone so script/style payloads never cross CDP. Removed
+# elements leave a space so the text on either side does not fuse into one word.
+_REDUCED_CONTENT_JS = """
+() => {
+    const clone = document.documentElement.cloneNode(true);
+    clone
+        .querySelectorAll("script,style,noscript,svg,iframe,template,link[rel=preload]")
+        .forEach((e) => e.replaceWith(" "));
+    return "<!DOCTYPE html>" + clone.outerHTML;
+}
+"""
+_PDF_CONTENT_TYPES = ("application/pdf", "application/x-pdf")
+# Interstitials whose content is never worth parsing
+_BLOCK_PAGE_MARKERS = (
+    "cf-challenge",
+    "<title>Just a moment...</title>",
+    "<title>Access Denied</title>",
+)
+HTTP_FAST_PATH_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/139.0.0.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+
+def _get_pdf_pool() -> ProcessPoolExecutor:
+    """Lazily create the process pool used for PDF conversion."""
+    global _pdf_pool
+    if _pdf_pool is None:
+        # spawn: forking a process that runs the browser driver threads is unsafe
+        _pdf_pool = ProcessPoolExecutor(
+            max_workers=PDF_MAX_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pdf_pool
+
+
+def _get_markdown_pool() -> ProcessPoolExecutor:
+    """Lazily create the process pool used for HTML to markdown conversion."""
+    global _markdown_pool
+    if _markdown_pool is None:
+        _markdown_pool = ProcessPoolExecutor(
+            max_workers=min(2, os.cpu_count() or 1),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _markdown_pool
+
+
+def _reset_pdf_pool(broken: ProcessPoolExecutor) -> None:
+    global _pdf_pool
+    if _pdf_pool is broken:
+        _pdf_pool = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def _reset_markdown_pool(broken: ProcessPoolExecutor) -> None:
+    global _markdown_pool
+    if _markdown_pool is broken:
+        _markdown_pool = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+async def _run_in_pool(
+    get_pool: Callable[[], ProcessPoolExecutor],
+    reset_pool: Callable[[ProcessPoolExecutor], None],
+    fn: Callable[..., _T],
+    *args: Any,
+) -> _T:
+    """Run fn in a lazily created process pool, retrying once on a fresh pool.
+
+    A worker that dies (OOM kill, native crash on hostile input) leaves its
+    pool permanently broken, so the broken pool is dropped, not reused.
+    """
+    loop = asyncio.get_running_loop()
+    pool = get_pool()
+    try:
+        return await loop.run_in_executor(pool, fn, *args)
+    except BrokenProcessPool:
+        reset_pool(pool)
+    # One retry on a fresh pool; a second break is reported to the caller
+    pool = get_pool()
+    try:
+        return await loop.run_in_executor(pool, fn, *args)
+    except BrokenProcessPool:
+        reset_pool(pool)
+        raise
+
+
+def _convert_pdf_worker(
+    pdf_bytes: bytes, pages: Optional[List[int]] = None
+) -> Tuple[str, str]:
+    """Convert PDF bytes to (markdown, title) using PyMuPDF and pymupdf4llm.
+
+    Runs in a worker process, so it only takes and returns picklable primitives.
+    `pages` restricts the conversion to those 0-based page numbers.
+    """
+    import pymupdf
+    import pymupdf4llm
+
+    doc = pymupdf.open(stream=pdf_bytes, filetype="pdf")
+    content = pymupdf4llm.to_markdown(doc, pages=pages)
+    title = (
+        doc.metadata.get("title", "pdf_document") if doc.metadata else "pdf_document"
+    )
+    return content, title
+
+
+def _pdf_page_count(pdf_bytes: bytes) -> int:
+    import pymupdf
+
+    with pymupdf.open(stream=pdf_bytes, filetype="pdf") as doc:
+        return doc.page_count
+
+
+async def _convert_pdf(pdf_bytes: bytes) -> Tuple[str, str]:
+    """Convert a PDF in the process pool, splitting long documents across workers"""
+    page_count = (
+        await asyncio.to_thread(_pdf_page_count, pdf_bytes)
+        if PDF_MAX_WORKERS > 1
+        else 0
+    )
+    if page_count < PDF_MIN_PAGES_PER_CHUNK * 2:
+        return await _run_in_pool(
+            _get_pdf_pool, _reset_pdf_pool, _convert_pdf_worker, pdf_bytes
+        )
+
+    n_chunks = min(PDF_MAX_WORKERS, page_count // PDF_MIN_PAGES_PER_CHUNK)
+    bounds = [page_count * i // n_chunks for i in range(n_chunks + 1)]
+    results = await asyncio.gather(
+        *(
+            _run_in_pool(
+                _get_pdf_pool,
+                _reset_pdf_pool,
+                _convert_pdf_worker,
+                pdf_bytes,
+                list(range(start, end)),
+            )
+            for start, end in zip(bounds, bounds[1:])
+        )
+    )
+    return "".join(content for content, _ in results), results[0][1]
+
+
+# Pure functions of the URL, hit on every rate-limit check, retry and cache key
+@functools.lru_cache(maxsize=4096)
+def _get_domain_cached(url: str) -> str:
+    domain = urlparse(url=url).netloc
+    parts = domain.split(".")
+    if len(parts) > 2:
+        domain = ".".join(parts[-2:])
+    return domain
+
+
+@functools.lru_cache(maxsize=4096)
+def _normalize_url_cached(url: str) -> str:
+    parsed = urlparse(url)
+    if not parsed.scheme:
+        return "https://" + url
+    return url
+
+
+class _InflightRequests:
+    """Counts a page's network requests that have not finished or failed yet"""
+
+    def __init__(self) -> None:
+        self.count = 0
+
+    def started(self, _request: Any) -> None:
+        self.count += 1
+
+    def finished(self, _request: Any) -> None:
+        self.count = max(0, self.count - 1)
+
+
+class TokenBucket:
+    """Token bucket allowing `rate` acquisitions per second with bursts up to `capacity`.
+
+    Callers reserve a token up front (the count may go negative) and sleep off
+    the debt, so no lock is held while waiting and waiters are served in order.
+    """
+
+    def __init__(self, rate: float, capacity: int) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens: float = capacity
+        self._last: Optional[float] = None
+
+    async def acquire(self) -> None:
+        now = asyncio.get_running_loop().time()
+        if self._last is not None:
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._last) * self.rate
+            )
+        self._last = now
+        self._tokens -= 1
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self.rate)
+
+    def is_full(self, now: float) -> bool:
+        """Whether the bucket has refilled completely, i.e. holds no state worth keeping"""
+        if self._last is None:
+            return True
+        return self._tokens + (now - self._last) * self.rate >= self.capacity
+
+
+class AdmissionLimiter:
+    """Caps concurrent holders like a semaphore, but the cap can be resized live"""
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.active = 0
+        self._cond = asyncio.Condition()
+
+    async def __aenter__(self) -> None:
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.active < self.limit)
+            self.active += 1
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        # Free the slot before awaiting the lock, and shield the wakeup, so a
+        # cancellation here can neither leak the slot nor strand a waiter
+        self.active -= 1
+        await asyncio.shield(self._notify_one())
+
+    async def _notify_one(self) -> None:
+        async with self._cond:
+            self._cond.notify(1)
+
+    async def set_limit(self, limit: int) -> None:
+        async with self._cond:
+            self.limit = limit
+            # Waiters re-check the predicate; a lower cap takes effect as holders leave
+            self._cond.notify_all()
 
 
 @asynccontextmanager
 async def scraper_context_manager(
     user_data_dir: str | None = None,
+    max_tabs: int | None = None,
 ) -> AsyncGenerator["Scraper", None]:
     """Async context manager for Scraper"""
-    scraper = Scraper(user_data_dir=user_data_dir)
+    scraper = Scraper(user_data_dir=user_data_dir, max_tabs=max_tabs)
     try:
         yield scraper
     finally:
@@ -38,18 +377,11 @@ class Scraper:
 
     @staticmethod
     def get_domain(url: str) -> str:
-        domain = urlparse(url=url).netloc
-        parts = domain.split(".")
-        if len(parts) > 2:
-            domain = ".".join(parts[-2:])
-        return domain
+        return _get_domain_cached(url)
 
     @staticmethod
     def normalize_url(url: str) -> str:
-        parsed = urlparse(url)
-        if not parsed.scheme:
-            return "https://" + url
-        return url
+        return _normalize_url_cached(url)
 
     @asynccontextmanager
     async def rate_limit_for_domain(self, url: str) -> AsyncGenerator[None, None]:
@@ -57,12 +389,13 @@ class Scraper:
         try:
             domain = self.get_domain(url)
 
-            semaphore = self._domain_semaphores.get(domain)
-            if not semaphore:
-                semaphore = asyncio.Semaphore(1)
-                self._domain_semaphores[domain] = semaphore
-
-            was_locked = semaphore.locked()
+            bucket = self._domain_buckets.get(domain)
+            if not bucket:
+                if len(self._domain_buckets) >= self._max_domain_buckets:
+                    self._prune_domain_buckets()
+                rate = self._domain_rate_overrides.get(domain, self._domain_rate)
+                bucket = TokenBucket(rate, self._domain_burst)
+                self._domain_buckets[domain] = bucket
         except Exception as e:
             self.logger.exception(
                 f"Rate limiting error for {url}: {str(e)}",
@@ -70,85 +403,45 @@ class Scraper:
             )
             raise
 
-        async with semaphore:
-            if was_locked:
-                await asyncio.sleep(random.uniform(0.6, 1.2))
-            yield
-
-    @staticmethod
-    async def natural_scroll(page: Page, delta_y: int, speed: float = 1.0) -> None:
-        """Simulate natural human-like scrolling with easing and speed control, ~1600 px/sec"""
-        max_chunk = int(120 * speed)  # Base wheel event size
-        remaining = abs(delta_y)
-        direction = 1 if delta_y > 0 else -1
-
-        while remaining > 0:
-            # Variable chunk sizes with slight randomness
-            chunk_size = min(remaining, random.randint(int(max_chunk * 0.5), max_chunk))
-            actual_chunk = chunk_size * direction
-
-            # Add human-like jitter
-            jitter = random.randint(-3, 3)
-            await page.mouse.wheel(0, actual_chunk + jitter)
+        await bucket.acquire()
+        # Bound the combined rate too, so many distinct domains can't burst at once
+        await self._global_bucket.acquire()
+        yield
 
-            remaining -= chunk_size
+    def set_domain_rate(self, domain: str, rps: float) -> None:
+        """Override the request rate for one domain"""
+        self._domain_rate_overrides[domain] = rps
+        self._domain_buckets[domain] = TokenBucket(rps, self._domain_burst)
 
-            if remaining > 0:
-                # Speed-adjusted delay with randomness
-                base_delay = (0.05 / speed) + random.uniform(-0.01, 0.02)
-                await asyncio.sleep(max(0.01, base_delay))
+    def _prune_domain_buckets(self) -> None:
+        """Drop buckets that have fully refilled; a fresh bucket behaves the same"""
+        now = asyncio.get_running_loop().time()
+        idle = [d for d, b in self._domain_buckets.items() if b.is_full(now)]
+        for domain in idle:
+            del self._domain_buckets[domain]
 
     @staticmethod
     async def scroll_page_to_bottom(page: Page, max_scroll_percent: int = 500) -> None:
-        """Scroll page to bottom with realistic behavior"""
-        total_scroll_percent = 0
-
-        while True:
-            try:
-                # Bring page to front before each scroll operation
-                await page.bring_to_front()
-
-                scroll_percent = random.randint(46, 97)
-                total_scroll_percent += scroll_percent
-
-                # Get viewport height for natural scrolling
-                viewport = page.viewport_size
-                if not viewport:
-                    # Fallback to default viewport size
-                    scroll_distance = int(800 * scroll_percent / 100)
-                else:
-                    scroll_distance = int(viewport["height"] * scroll_percent / 100)
-
-                # Use natural human-like scrolling
-                scroll_speed = random.uniform(
-                    1.0, 1.7
-                )  # Vary scrolling speed (1600-2800 px/sec)
-                await asyncio.wait_for(
-                    Scraper.natural_scroll(page, scroll_distance, scroll_speed),
-                    timeout=6,
-                )
-
-                await asyncio.sleep(random.uniform(0.23, 0.56))
-                await Scraper.wait_or_timeout(page, "load", 2)
-
-                if total_scroll_percent >= max_scroll_percent:
-                    break
+        """Scroll page to bottom with realistic behavior, driven entirely in-page"""
+        try:
+            await page.bring_to_front()
+            # One evaluate for the whole scroll session instead of a protocol
+            # round trip per wheel event and bottom check
+            await asyncio.wait_for(
+                page.evaluate(_SCROLL_TO_BOTTOM_JS, max_scroll_percent), timeout=15
+            )
+        except asyncio.TimeoutError:
+            Scraper.logger.warning("Scrolling timed out, assuming at bottom")
+        except Exception as e:
+            Scraper.logger.warning(f"Error during scrolling: {e}")
 
-                # Check if at bottom
-                at_bottom = await asyncio.wait_for(
-                    page.evaluate(
-                        "window.innerHeight + window.scrollY >= document.scrollingElement.scrollHeight"
-                    ),
-                    timeout=3,
-                )
-                if cast(bool, at_bottom):
-                    break
-            except asyncio.TimeoutError:
-                Scraper.logger.warning("Scrolling timed out, assuming at bottom")
-                break
-            except Exception as e:
-                Scraper.logger.warning(f"Error during scrolling: {e}")
-                break
+    @staticmethod
+    async def _is_short_complete_page(page: Page) -> bool:
+        """Whether the page already has plenty of text and barely scrolls"""
+        try:
+            return bool(await page.evaluate(_SHORT_COMPLETE_PAGE_JS))
+        except Exception:
+            return False
 
     @staticmethod
     async def wait_or_timeout(
@@ -158,17 +451,19 @@ class Scraper:
     ) -> None:
         """Wait for page load state with timeout"""
         try:
-            await asyncio.wait_for(
-                page.wait_for_load_state(until, timeout=timeout * 1000), timeout
-            )
-        except asyncio.TimeoutError:
+            await page.wait_for_load_state(until, timeout=timeout * 1000)
+        except PlaywrightTimeoutError:
             Scraper.logger.warning(
                 f"timeout waiting for {until} after {timeout} seconds",
                 extra={"until": until, "timeout": timeout},
             )
 
     async def _perform_scrape_operation(
-        self, page: Page, url: str, output_format: Literal["text", "markdown", "html"]
+        self,
+        page: Page,
+        url: str,
+        output_format: Literal["text", "markdown", "html"],
+        wait_for_network_idle: bool = False,
     ) -> Tuple[str, list[dict[str, Any]], str]:
         """Perform the actual scraping operation on a page"""
         # Use browser navigation response to keep fingerprint clean and detect PDFs reliably
@@ -176,20 +471,31 @@ class Scraper:
 
         # If navigation returns a PDF, parse it directly from the response body
         try:
-            content_type = (
-                (response.headers.get("content-type") if response else "") or ""
-            ).lower()
-            content_disp = (
-                (response.headers.get("content-disposition") if response else "") or ""
-            ).lower()
-            # Robust, fingerprint-clean detection via response headers only
-            is_pdf = ("application/pdf" in content_type) or (
-                "filename=" in content_disp and ".pdf" in content_disp
-            )
+            headers = response.headers if response else {}
+            content_type = (headers.get("content-type") or "").lower()
+            # Robust, fingerprint-clean detection via the navigation response
+            is_pdf = content_type.startswith(_PDF_CONTENT_TYPES)
+            if not is_pdf and "content-disposition" in headers:
+                content_disp = headers["content-disposition"].lower()
+                is_pdf = "filename=" in content_disp and ".pdf" in content_disp
+            pdf_bytes: Optional[bytes] = None
+            if (
+                not is_pdf
+                and response is not None
+                and content_type
+                and not content_type.startswith("text/")
+                and "html" not in content_type
+            ):
+                # PDFs are sometimes served as octet-stream; sniff the magic number
+                pdf_bytes = await response.body()
+                is_pdf = pdf_bytes.startswith(b"%PDF-")
             if is_pdf and response is not None:
                 try:
-                    pdf_bytes = await response.body()
-                    content, title = Scraper._parse_pdf_to_markdown(pdf_bytes)
+                    if pdf_bytes is None:
+                        pdf_bytes = await response.body()
+                    # PDF conversion is CPU-bound; run it in a worker process so
+                    # several PDFs convert in parallel without holding the GIL
+                    content, title = await _convert_pdf(pdf_bytes)
                     return content, [], title
                 except Exception as e:
                     # Any issue in detection/parsing: proceed with standard HTML flow
@@ -202,16 +508,33 @@ class Scraper:
             self.logger.error(f"Failed to open page for {url}: page is None")
             return f"Failed to open page for {url}: page is None", [], ""
 
-        await self.wait_or_timeout(page, "load", 5)
-        # wait for potential redirection
+        # page.goto already waited for load; wait for potential redirection
         await asyncio.sleep(random.uniform(0.3, 0.7))
-        await self.wait_or_timeout(page, "networkidle", 2)
+        if wait_for_network_idle:
+            # Static pages are already idle; only wait when requests are still pending
+            inflight = self._inflight_requests.get(page)
+            if inflight is None or inflight.count > 0:
+                await self.wait_or_timeout(page, "networkidle", 2)
+        else:
+            # networkidle never settles on pages with analytics or long polling;
+            # a rendered body is a cheaper and more reliable signal
+            try:
+                await page.wait_for_function(_DOM_SETTLED_JS, timeout=1500)
+            except PlaywrightTimeoutError:
+                pass
 
-        await self.scroll_page_to_bottom(page)
+        if not await self._is_short_complete_page(page):
+            await self.scroll_page_to_bottom(page)
 
         content_timeout = 10
         try:
-            html = await asyncio.wait_for(page.content(), timeout=content_timeout)
+            # html output keeps full fidelity; the other formats drop those tags anyway
+            html_future = (
+                page.content()
+                if output_format == "html"
+                else page.evaluate(_REDUCED_CONTENT_JS)
+            )
+            html = await asyncio.wait_for(html_future, timeout=content_timeout)
         except asyncio.TimeoutError:
             self.logger.error(
                 f"Timeout getting content for {url}",
@@ -223,69 +546,119 @@ class Scraper:
                 "",
             )
 
-        soup = BeautifulSoup(html, "lxml")
-        title = extract_title(soup)
+        head = html[:4096]
+        if any(marker in head for marker in _BLOCK_PAGE_MARKERS):
+            self.logger.warning(f"Blocked by an interstitial page at {url}")
+            return f"Blocked by an interstitial page at {url}", [], ""
 
-        decompose_irrelevant_imgs = True
-        if output_format == "html":
-            decompose_irrelevant_imgs = False
-        image_urls = get_relevant_images(
-            soup,
-            url,
-            title,
-            decompose_irrelevant=decompose_irrelevant_imgs,
+        content, image_urls, title = await self._parse_html_async(
+            html, url, output_format
         )
 
-        if output_format == "html":
-            content = str(soup)
-        elif output_format == "markdown":
-            soup = clean_soup(soup)
-            content = get_markdown_from_soup(soup)
-        else:  # text format (default)
-            soup = clean_soup(soup)
-            content = get_text_from_soup(soup)
-
         if len(content) < 400:
             self.logger.warning(
                 f"Content is too short from {url}. Title: {title}, Content length: {len(content)},\\n"
                 f"excerpt: {content}."
             )
             if self.debug:
-                screenshot_dir = Path("logs/screenshots")
-                screenshot_dir.mkdir(exist_ok=True)
-                screenshot_path = (
-                    screenshot_dir / f"screenshot-error-{Scraper.get_domain(url)}.png"
-                )
-                try:
-                    await asyncio.wait_for(
-                        page.screenshot(path=screenshot_path), timeout=5.0
-                    )
-                except asyncio.TimeoutError:
-                    self.logger.warning(f"Screenshot timeout for {url}, continuing...")
-                except Exception as screenshot_error:
-                    self.logger.warning(
-                        f"Screenshot failed for {url}: {screenshot_error}"
-                    )
-                self.logger.warning(
-                    f"check screenshot at [{screenshot_path}] for more details."
+                # Taken by the cleanup worker, after the tab slot and rate limit are released
+                self._pending_screenshots[page] = (
+                    self._screenshot_dir
+                    / f"screenshot-error-{Scraper.get_domain(url)}.jpeg"
                 )
 
         return content, image_urls, title
 
     @staticmethod
-    def _parse_pdf_to_markdown(pdf_bytes: bytes) -> Tuple[str, str]:
-        """Convert PDF bytes to (markdown, title) using PyMuPDF and pymupdf4llm."""
-        import pymupdf
-        import pymupdf4llm
-
-        doc = pymupdf.open(stream=pdf_bytes, filetype="pdf")
-        content = pymupdf4llm.to_markdown(doc)
-        title = (
-            doc.metadata.get("title", "pdf_document")
-            if doc.metadata
-            else "pdf_document"
-        )
-        return content, title
+    async def _parse_html_async(
+        html: str, url: str, output_format: Literal["text", "markdown", "html"]
+    ) -> Tuple[str, list[dict[str, Any]], str]:
+        """Run _parse_html off the event loop"""
+        if output_format == "markdown":
+            # BeautifulSoup and markdownify are pure Python and hold the GIL
+            # throughout, so threads would not let them run in parallel
+            return await _run_in_pool(
+                _get_markdown_pool,
+                _reset_markdown_pool,
+                Scraper._parse_html,
+                html,
+                url,
+                output_format,
+            )
+        # lxml releases the GIL while parsing, so a thread is enough
+        return await asyncio.to_thread(Scraper._parse_html, html, url, output_format)
+
+    @staticmethod
+    def _parse_html(
+        html: str, url: str, output_format: Literal["text", "markdown", "html"]
+    ) -> Tuple[str, list[dict[str, Any]], str]:
+        """Extract (content, images, title) from a page's HTML"""
+        if output_format in ("text", "html"):
+            # Neither format needs BeautifulSoup features; lxml does it in C
+            tree = parse_html_tree(html)
+            title = extract_title_from_tree(tree)
+            image_urls = get_relevant_images_from_tree(tree, url, title)
+            if output_format == "html":
+                # The page's own serialization is already the payload
+                content = html
+            else:
+                content = get_text_from_tree(tree)
+            return content, image_urls, title
+
+        # markdownify converts soup objects, so markdown stays on BeautifulSoup
+        soup = BeautifulSoup(html, "lxml")
+        title = extract_title(soup)
+        image_urls = get_relevant_images(soup, url, title, decompose_irrelevant=True)
+        soup = clean_soup(soup)
+        content = get_markdown_from_soup(soup)
+
+        return content, image_urls, title
+
+    @staticmethod
+    def _needs_js(html: str) -> bool:
+        """Heuristic: the page is an empty SPA shell that renders client-side"""
+        return _SPA_SHELL_RE.search(html) is not None
+
+    async def _get_http_session(self) -> aiohttp.ClientSession:
+        """Shared HTTP session for the fast path, with pooled connections and DNS cache"""
+        if self._http_session is None or self._http_session.closed:
+            self._http_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=100, limit_per_host=4, ttl_dns_cache=300
+                ),
+                timeout=aiohttp.ClientTimeout(total=5),
+                headers=HTTP_FAST_PATH_HEADERS,
+            )
+        return self._http_session
+
+    async def _try_http_fetch(
+        self, url: str, output_format: Literal["text", "markdown", "html"]
+    ) -> Optional[Tuple[str, list[dict[str, Any]], str]]:
+        """Fetch static HTML without a browser; None means fall back to the browser"""
+        try:
+            session = await self._get_http_session()
+            async with session.get(url) as response:
+                content_type = response.headers.get("content-type", "").lower()
+                if response.status != 200 or "text/html" not in content_type:
+                    return None
+                html = await response.text()
+        except Exception as e:
+            self.logger.debug("HTTP fast path failed for %s: %s", url, e)
+            return None
+
+        if self._needs_js(html):
+            return None
+
+        try:
+            content, image_urls, title = await self._parse_html_async(
+                html, url, output_format
+            )
+        except Exception as e:
+            self.logger.debug("HTTP fast path parse failed for %s: %s", url, e)
+            return None
+        if len(content) < 400:
+            return None
+        return content, image_urls, title
 
     async def _release_context(self) -> None:
         """Clean up context and driver when no active scraping pages remain"""
@@ -304,6 +677,8 @@ class Scraper:
                         if self._context_refcount <= 0 and self._shared_context:
                             await self._shared_context.close()
                             self._shared_context = None
+                            self._page_pool.clear()
+                            self._context_pages_served = 0
                             if self._shared_driver:
                                 await self._shared_driver.stop()
                                 self._shared_driver = None
@@ -314,11 +689,32 @@ class Scraper:
 
     async def cleanup_on_exit(self) -> None:
         """Clean up shared resources on exit"""
+        global _pdf_pool, _markdown_pool
+        if self._cleanup_worker_task is not None:
+            # Let queued pages close properly before tearing the worker down
+            if not self._cleanup_worker_task.done():
+                try:
+                    await asyncio.wait_for(self._cleanup_queue.join(), timeout=5.0)
+                except asyncio.TimeoutError:
+                    self.logger.warning("Timed out draining the page cleanup queue")
+            self._cleanup_worker_task.cancel()
+            self._cleanup_worker_task = None
+        if _pdf_pool is not None:
+            _pdf_pool.shutdown(wait=False, cancel_futures=True)
+            _pdf_pool = None
+        if _markdown_pool is not None:
+            _markdown_pool.shutdown(wait=False, cancel_futures=True)
+            _markdown_pool = None
+        if self._http_session is not None:
+            await self._http_session.close()
+            self._http_session = None
+
         try:
             if self._shared_context:
                 async with self._context_lock:
                     await self._shared_context.close()
                     self._shared_context = None
+                    self._page_pool.clear()
             if self._shared_driver:
                 await self._shared_driver.stop()
                 self._shared_driver = None
@@ -328,18 +724,22 @@ class Scraper:
     async def _cleanup_chrome_locks(self) -> None:
         """Remove Chrome profile lock files that may prevent browser startup"""
         try:
-            # Kill any existing Chrome processes first
-            import subprocess
-
+            # Kill leftover Chrome processes still holding our profile, and only those
+            profile_arg = f"--user-data-dir={os.path.abspath(self._user_data_dir)}"
             try:
-                result = subprocess.run(
-                    ["pkill", "-f", "chrome"], capture_output=True, text=True
+                proc = await asyncio.create_subprocess_exec(
+                    "pkill",
+                    "-f",
+                    "--",
+                    re.escape(profile_arg),
+                    stdout=asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.DEVNULL,
                 )
-                if result.returncode == 0:
+                if await proc.wait() == 0:
                     self.logger.info("Killed existing Chrome processes")
-                await asyncio.sleep(1)  # Give processes time to terminate
+                    await asyncio.sleep(1)  # Give processes time to terminate
             except Exception as e:
-                self.logger.debug(f"No Chrome processes to kill or pkill failed: {e}")
+                self.logger.debug("No Chrome processes to kill or pkill failed: %s", e)
 
             lock_files = ["SingletonLock", "SingletonSocket", "SingletonCookie"]
             removed_count = 0
@@ -381,25 +781,141 @@ class Scraper:
         self, headless: bool = False
     ) -> AsyncGenerator[BrowserContext, None]:
         """Get the shared persistent context with reference counting"""
-        async with self._context_lock:
-            await self._ensure_shared_context(headless)
+        if (
+            self._shared_context is not None
+            and self._context_pages_served < self._max_pages_per_context
+            and not self._context_lock.locked()
+        ):
+            # Fast path: the context is live and nobody is launching, recycling
+            # or closing it, so the lock would be uncontended anyway
             self._context_refcount += 1
+            self._context_pages_served += 1
+        else:
+            async with self._context_lock:
+                if (
+                    self._shared_context is not None
+                    and self._context_pages_served >= self._max_pages_per_context
+                ):
+                    # Long-lived contexts keep growing; drain in-flight pages and
+                    # relaunch so the browser's memory is returned
+                    await self._context_idle.wait_for(
+                        lambda: (
+                            self._context_refcount <= 0
+                            or self._context_pages_served < self._max_pages_per_context
+                        )
+                    )
+                    # Another waiter may have recycled it while we slept
+                    if self._context_pages_served >= self._max_pages_per_context:
+                        if self._shared_context is not None:
+                            await self._shared_context.close()
+                            self._shared_context = None
+                            self._page_pool.clear()
+                        self._context_pages_served = 0
+                await self._ensure_shared_context(headless)
+                self._context_refcount += 1
+                self._context_pages_served += 1
         try:
             yield cast(BrowserContext, self._shared_context)
         finally:
-            async with self._context_lock:
-                self._context_refcount -= 1
+            self._context_refcount -= 1
+            if self._context_refcount <= 0:
+                async with self._context_lock:
+                    self._context_idle.notify_all()
 
-    def __init__(self, user_data_dir: str | None = None) -> None:
-        self.debug: bool = True
+    def __init__(
+        self, user_data_dir: str | None = None, max_tabs: int | None = None
+    ) -> None:
+        # Screenshots of pages that yield too little content; opt-in, as each
+        # is a full image encode sent over CDP
+        debug_screenshots = os.getenv("SCRAPER_DEBUG_SCREENSHOTS", "")
+        self.debug: bool = debug_screenshots.lower() in ("1", "true", "yes")
         self._shared_driver: Optional[Playwright] = None
         self._shared_context: Optional[BrowserContext] = None
         self._context_lock: asyncio.Lock = asyncio.Lock()
         self._context_refcount: int = 0
-        self._domain_semaphores: Dict[str, asyncio.Semaphore] = {}
-        self._max_tabs: int = 10
-        self._tab_semaphore: asyncio.Semaphore = asyncio.Semaphore(self._max_tabs)
+        self._context_idle: asyncio.Condition = asyncio.Condition(self._context_lock)
+        self._context_pages_served: int = 0
+        self._max_pages_per_context: float = self._default_max_pages_per_context()
+        self._cleanup_queue: asyncio.Queue[Tuple[Page, str]] = asyncio.Queue(
+            maxsize=100
+        )
+        self._cleanup_worker_task: Optional[asyncio.Task] = None
+        self._page_pool: List[Page] = []
+        self._inflight_requests: weakref.WeakKeyDictionary[Page, _InflightRequests] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._pending_screenshots: weakref.WeakKeyDictionary[Page, Path] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._screenshot_dir = Path("logs/screenshots")
+        if self.debug:
+            self._screenshot_dir.mkdir(parents=True, exist_ok=True)
+        self._domain_buckets: Dict[str, TokenBucket] = {}
+        self._domain_rate: float = 2.0  # requests per second per domain
+        self._domain_burst: int = 4
+        self._domain_rate_overrides: Dict[str, float] = {}
+        self._max_domain_buckets: int = 1024
+        self._global_bucket = TokenBucket(rate=10.0, capacity=20)
+        self._max_tabs: int = max_tabs or self._default_max_tabs()
+        self._tab_limiter = AdmissionLimiter(self._max_tabs)
+        # One reusable page per tab slot, so a full burst never opens new pages
+        self._max_idle_pages: int = self._max_tabs
         self._user_data_dir = user_data_dir or "./browser_data"
+        # Opt-in: a plain GET changes the request fingerprint, so the browser
+        # stays the default for every page
+        http_first = os.getenv("SCRAPER_HTTP_FIRST", "")
+        self._http_first: bool = http_first.lower() in ("1", "true", "yes")
+        self._http_session: Optional[aiohttp.ClientSession] = None
+        # Opt-in as well: pages that never load images look less like a real user
+        block_resources = os.getenv("SCRAPER_BLOCK_RESOURCES", "")
+        self._block_resources: bool = block_resources.lower() in ("1", "true", "yes")
+
+    async def set_max_tabs(self, max_tabs: int) -> None:
+        """Change the number of concurrent browser tabs at runtime"""
+        self._max_tabs = max_tabs
+        self._max_idle_pages = max_tabs
+        await self._tab_limiter.set_limit(max_tabs)
+
+    @staticmethod
+    def _default_max_tabs() -> int:
+        """Tab limit from SCRAPER_MAX_TABS, else two per CPU, clamped to 2..32.
+
+        Each Chromium tab costs roughly 50-100MB, so the limit is also capped
+        at ten tabs per GB of physical memory where that can be read.
+        """
+        env_tabs = os.getenv("SCRAPER_MAX_TABS", "")
+        if env_tabs.isdigit() and int(env_tabs) > 0:
+            return int(env_tabs)
+        tabs = (os.cpu_count() or 4) * 2
+        try:
+            mem_gb = os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") / 2**30
+            tabs = min(tabs, int(mem_gb * 10))
+        except (AttributeError, ValueError, OSError):
+            pass
+        return max(2, min(tabs, 32))
+
+    @staticmethod
+    def _default_max_pages_per_context() -> float:
+        """Pages served before the shared context is recycled, from
+        SCRAPER_MAX_PAGES_PER_CONTEXT (0 disables recycling), else 2000.
+
+        The context is a persistent Chrome context, so recycling relaunches the
+        whole browser and first drains every in-flight page; it should be rare.
+        """
+        env_pages = os.getenv("SCRAPER_MAX_PAGES_PER_CONTEXT", "")
+        if env_pages.isdigit():
+            return int(env_pages) or math.inf
+        return 2000
+
+    async def warmup(self, headless: bool = False) -> None:
+        """Launch the browser ahead of the first scrape and park a ready page"""
+        try:
+            async with self.get_context(headless) as context:
+                page = await self._acquire_page(context)
+                self._page_pool.append(page)
+            self.logger.info("Browser warmed up")
+        except Exception as e:
+            self.logger.warning(f"Browser warmup failed: {type(e).__name__}: {e}")
 
     async def scrape_async(
         self,
@@ -407,6 +923,7 @@ class Scraper:
         max_retries: int = 1,
         output_format: Literal["text", "markdown", "html"] = "markdown",
         timeout: float = 30.0,
+        wait_for_network_idle: bool = False,
     ) -> Tuple[str, list[dict[str, Any]], str]:
         url = Scraper.normalize_url(url)
         if not url:
@@ -419,7 +936,8 @@ class Scraper:
         for attempt in range(max_retries + 1):
             try:
                 return await asyncio.wait_for(
-                    self._scrape_attempt(url, output_format), timeout=timeout
+                    self._scrape_attempt(url, output_format, wait_for_network_idle),
+                    timeout=timeout,
                 )
             except Exception as e:
                 is_last_attempt = attempt == max_retries
@@ -451,30 +969,146 @@ class Scraper:
         return "Maximum retry attempts exceeded", [], ""
 
     async def _scrape_attempt(
-        self, url: str, output_format: Literal["text", "markdown", "html"]
+        self,
+        url: str,
+        output_format: Literal["text", "markdown", "html"],
+        wait_for_network_idle: bool = False,
     ) -> Tuple[str, list[dict[str, Any]], str]:
         """Single scraping attempt with all setup and cleanup"""
         page: Optional[Page] = None
         try:
-            async with AsyncExitStack() as stack:
-                # Acquire resources in order: rate limit, then semaphore, then context
-                await stack.enter_async_context(self.rate_limit_for_domain(url))
-                await stack.enter_async_context(self._tab_semaphore)
-                context = await stack.enter_async_context(self.get_context())
-
-                page = await context.new_page()
-                return await self._perform_scrape_operation(page, url, output_format)
+            # Acquire resources in order: rate limit, then a tab slot, then context
+            async with self.rate_limit_for_domain(url):
+                if self._http_first:
+                    result = await self._try_http_fetch(url, output_format)
+                    if result is not None:
+                        return result
+                async with self._tab_limiter, self.get_context() as context:
+                    page = await self._acquire_page(context, wait_for_network_idle)
+                    return await self._perform_scrape_operation(
+                        page, url, output_format, wait_for_network_idle
+                    )
         finally:
-            # Clean up the page after AsyncExitStack has released all resources
+            # Clean up the page after all resources have been released
             if page:
-                # Fire and forget cleanup to avoid blocking the main flow
-                asyncio.create_task(self._release_page(page, url))
+                # Hand off to the cleanup worker to avoid blocking the main flow;
+                # close inline only if the worker has fallen far behind
+                self._ensure_cleanup_worker()
+                try:
+                    self._cleanup_queue.put_nowait((page, url))
+                except asyncio.QueueFull:
+                    await self._release_page(page, url)
+
+    async def _acquire_page(
+        self, context: BrowserContext, track_requests: bool = False
+    ) -> Page:
+        """Reuse an idle page from the pool, or open a new one.
+
+        With track_requests, the page counts its in-flight requests until it
+        is released, so a network-idle wait can be skipped on idle pages.
+        """
+        page: Optional[Page] = None
+        while self._page_pool:
+            candidate = self._page_pool.pop()
+            # Pages from a closed or recycled context are dead
+            if not candidate.is_closed() and candidate.context is context:
+                page = candidate
+                break
+
+        if page is None:
+            page = await context.new_page()
+            if self._block_resources:
+                # The CDP blocking stays attached while the page is pooled
+                await self._block_heavy_resources(context, page)
+
+        if track_requests:
+            self._track_requests(page)
+        return page
+
+    def _track_requests(self, page: Page) -> None:
+        inflight = _InflightRequests()
+        page.on("request", inflight.started)
+        page.on("requestfinished", inflight.finished)
+        page.on("requestfailed", inflight.finished)
+        self._inflight_requests[page] = inflight
+
+    def _untrack_requests(self, page: Page) -> None:
+        inflight = self._inflight_requests.pop(page, None)
+        if inflight is not None:
+            page.remove_listener("request", inflight.started)
+            page.remove_listener("requestfinished", inflight.finished)
+            page.remove_listener("requestfailed", inflight.finished)
+
+    async def _block_heavy_resources(self, context: BrowserContext, page: Page) -> None:
+        """Block images, fonts and media at the network layer via CDP"""
+        try:
+            # CDP blocking avoids the per-request interception overhead of page.route
+            session = await context.new_cdp_session(page)
+            await session.send("Network.enable")
+            await session.send(
+                "Network.setBlockedURLs", {"urls": list(BLOCKED_RESOURCE_PATTERNS)}
+            )
+        except Exception as e:
+            self.logger.warning(f"Failed to block heavy resources: {e}")
+
+    def _ensure_cleanup_worker(self) -> None:
+        if self._cleanup_worker_task is None or self._cleanup_worker_task.done():
+            self._cleanup_worker_task = asyncio.create_task(self._cleanup_worker())
+
+    async def _cleanup_worker(self) -> None:
+        """Close finished pages one at a time from the cleanup queue"""
+        while True:
+            page, url = await self._cleanup_queue.get()
+            try:
+                await self._close_page(page, url)
+                # Only consider releasing the context once the backlog is drained
+                if self._cleanup_queue.empty():
+                    await self._release_context()
+            finally:
+                self._cleanup_queue.task_done()
 
     async def _release_page(self, page: Page, url: str) -> None:
         """Clean up page resources asynchronously"""
+        if await self._close_page(page, url):
+            await self._release_context()
+
+    async def _take_debug_screenshot(
+        self, page: Page, url: str, screenshot_path: Path
+    ) -> None:
+        try:
+            await asyncio.wait_for(
+                page.screenshot(path=screenshot_path, type="jpeg", quality=60),
+                timeout=5.0,
+            )
+        except asyncio.TimeoutError:
+            self.logger.warning(f"Screenshot timeout for {url}, continuing...")
+            return
+        except Exception as screenshot_error:
+            self.logger.warning(f"Screenshot failed for {url}: {screenshot_error}")
+            return
+        self.logger.warning(
+            f"check screenshot at [{screenshot_path}] for more details."
+        )
+
+    async def _close_page(self, page: Page, url: str) -> bool:
+        """Return a page to the pool or close it, returning whether that succeeded"""
+        self._untrack_requests(page)
+        screenshot_path = self._pending_screenshots.pop(page, None)
+        if screenshot_path is not None and not page.is_closed():
+            await self._take_debug_screenshot(page, url, screenshot_path)
+
+        if len(self._page_pool) < self._max_idle_pages and not page.is_closed():
+            try:
+                # Blank the page so it drops the old document before it is reused
+                await asyncio.wait_for(page.goto("about:blank"), timeout=5.0)
+                self._page_pool.append(page)
+                return True
+            except Exception as e:
+                self.logger.debug("Could not recycle page, closing it: %s", e)
+
         try:
             await asyncio.wait_for(page.close(), timeout=10.0)
-            await self._release_context()
+            return True
         except asyncio.TimeoutError:
             self.logger.error(
                 "Page close timed out after 10 seconds",
@@ -485,3 +1119,4 @@ class Scraper:
                 f"Failed to close page: {type(cleanup_error).__name__}: {str(cleanup_error)}",
                 extra={"url": url},
             )
+        return False
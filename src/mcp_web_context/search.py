@@ -1,5 +1,5 @@
 import asyncio
-import math
+import json
 import os
 import urllib.parse
 import aiohttp
@@ -8,8 +8,24 @@ import logging
 from pydantic import BaseModel, Field
 import urllib
 
+from .cache import async_cache_result
+
 logger = logging.getLogger(__name__)
 
+# Video results have no readable page content
+_BLOCKED_HOSTS = frozenset(
+    {"youtube.com", "www.youtube.com", "m.youtube.com", "youtu.be"}
+)
+
+
+def _is_blocked_link(link: str) -> bool:
+    # hostname is already lowercased and stripped of userinfo and port
+    try:
+        return urllib.parse.urlsplit(link).hostname in _BLOCKED_HOSTS
+    except ValueError:
+        # Malformed links such as "http://[bad" are not worth failing a search
+        return False
+
 
 class SearchResultEntry(BaseModel):
     title: str
@@ -22,6 +38,32 @@ class GoogleSearch:
     Google API Retriever
     """
 
+    # Shared across searches so keep-alive connections to the API are reused
+    _session: aiohttp.ClientSession | None = None
+    # Backpressure for concurrent searches on top of the connector's socket limits
+    _search_semaphore = asyncio.Semaphore(10)
+
+    @classmethod
+    def get_session(cls) -> aiohttp.ClientSession:
+        """Get the shared HTTP session, creating it on first use"""
+        if cls._session is None or cls._session.closed:
+            cls._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=100,
+                    limit_per_host=5,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=60,
+                )
+            )
+        return cls._session
+
+    @classmethod
+    async def close_session(cls) -> None:
+        """Close the shared HTTP session"""
+        if cls._session is not None:
+            await cls._session.close()
+            cls._session = None
+
     def __init__(self, query, headers=None, query_domains=None):
         """
         Initializes the GoogleSearch object
@@ -96,127 +138,71 @@ class GoogleSearch:
 
         res = []
         try:
-            async with aiohttp.ClientSession() as session:
-                # Calculate how many pages we need to fetch
-                pages = math.ceil(total_results_to_fetch / results_per_request)
-
-                for page in range(pages):
-                    start_index = (
-                        page * results_per_request + 1
-                    )  # Google API is 1-based
-
-                    url = (
-                        f"https://www.googleapis.com/customsearch/v1"
-                        f"?key={self.api_key}"
-                        f"&cx={self.cx_key}&q={encoded_query}&start={start_index}"
-                    )
+            session = GoogleSearch.get_session()
+            # Calculate how many pages we need to fetch
+            pages = -(-total_results_to_fetch // results_per_request)
 
-                    logger.debug(
-                        f"Requesting Google CSE page {page + 1}, start={start_index}",
-                        extra={
-                            "query": self.query,
-                            "page": page + 1,
-                            "start_index": start_index,
-                        },
+            def fetch(page: int):
+                return self._fetch_page(
+                    session,
+                    self.cx_key,
+                    encoded_query,
+                    page,
+                    page * results_per_request + 1,  # Google API is 1-based
+                )
+
+            # Every page is a paid API call: fetch the first one alone, and only
+            # request the rest at once when it came back full
+            async with GoogleSearch._search_semaphore:
+                page_results = [await fetch(0)]
+                first_page = page_results[0]
+                if (
+                    pages > 1
+                    and first_page is not None
+                    and len(first_page.get("items", [])) >= results_per_request
+                ):
+                    page_results += await asyncio.gather(
+                        *(fetch(page) for page in range(1, pages))
                     )
 
-                    try:
-                        async with session.get(url) as resp:
-                            if not (200 <= resp.status < 300):
-                                body = await resp.text()
-                                logger.error(
-                                    f"Google search: unexpected response status: {resp.status}",
-                                    extra={
-                                        "status": resp.status,
-                                        "url": url,
-                                        "query": self.query,
-                                        "page": page + 1,
-                                        "start_index": start_index,
-                                        "body_snippet": body[:300],
-                                    },
-                                )
-                                return None
-                            search_results = await resp.json()
-                            if "error" in search_results:
-                                err = search_results.get("error", {})
-                                logger.error(
-                                    "Google CSE API returned error",
-                                    extra={
-                                        "query": self.query,
-                                        "url": url,
-                                        "page": page + 1,
-                                        "start_index": start_index,
-                                        "api_error": err,
-                                    },
-                                )
-                                return None
-                    except aiohttp.ClientError as e:
-                        logger.exception(
-                            f"Google CSE connection error: {e}",
-                            extra={
-                                "query": self.query,
-                                "url": url,
-                                "page": page + 1,
-                                "start_index": start_index,
-                            },
-                        )
-                        return None
-                    except Exception as e:
-                        logger.exception(
-                            f"Error retrieving or parsing Google API response: {e}",
-                            extra={
-                                "query": self.query,
-                                "url": url,
-                                "page": page + 1,
-                                "start_index": start_index,
-                            },
-                        )
-                        return None
+            for page, search_results in enumerate(page_results):
+                if search_results is None:
+                    return None
 
-                    items = search_results.get("items", [])
-                    if not items:
-                        logger.info(
-                            "No more items returned by the API.",
-                            extra={"query": self.query, "page": page + 1},
-                        )
-                        break
+                items = search_results.get("items", [])
+                if not items:
+                    logger.info(
+                        "No more items returned by the API.",
+                        extra={"query": self.query, "page": page + 1},
+                    )
+                    break
 
-                    for item in items:
-                        link = item.get("link", "")
-                        # skip youtube results, and duplicates
-                        if "youtube.com" in link or link in seen_links:
-                            continue
-                        title = item.get("title", "")
-                        snippet = item.get("snippet", "")
-                        if not (link and title):
-                            continue
-                        try:
-                            search_result = SearchResultEntry(
-                                title=title,
-                                link=link,
-                                snippet=snippet,
-                            )
-                            res.append(search_result)
-                            seen_links.add(link)
-                        except Exception as e:
-                            logger.exception(
-                                f"Error creating SearchResultEntry: {e}",
-                                extra={"link": link, "title": title},
-                            )
-                            continue
-
-                        if len(res) >= max_results:
-                            break
+                for item in items:
+                    link = item.get("link", "")
+                    # skip youtube results, and duplicates
+                    if link in seen_links or _is_blocked_link(link):
+                        continue
+                    title = item.get("title", "")
+                    snippet = item.get("snippet", "")
+                    if not (link and title):
+                        continue
+                    # The API returns plain strings, so skip pydantic validation
+                    res.append(
+                        SearchResultEntry.model_construct(
+                            title=title, link=link, snippet=snippet
+                        )
+                    )
+                    seen_links.add(link)
 
                     if len(res) >= max_results:
                         break
 
-                    # If we get fewer than the per-request max, don't bother querying more
-                    if len(items) < results_per_request:
-                        break
+                if len(res) >= max_results:
+                    break
 
-                    # Respect possible API throttling.
-                    await asyncio.sleep(0.1)
+                # Fewer than the per-request max means later pages are empty
+                if len(items) < results_per_request:
+                    break
         except Exception as e:
             logger.exception(
                 f"Unexpected error in Google Custom Search flow. {e}",
@@ -225,3 +211,91 @@ class GoogleSearch:
             return None
 
         return res[:max_results]
+
+    # Repeat queries are served from the shared cache instead of spending API quota;
+    # the cache key is built from the str/int arguments, so it never holds the API key
+    @async_cache_result(
+        argument_serializers={str: str, int: str},
+        result_serializer=json.dumps,
+        result_deserializer=json.loads,
+        predicate=lambda x: x is not None,
+    )
+    async def _fetch_page(
+        self,
+        session: aiohttp.ClientSession,
+        cx_key: str,
+        encoded_query: str,
+        page: int,
+        start_index: int,
+    ) -> dict | None:
+        """Fetch one page of Google CSE results, or None on error"""
+        url = (
+            f"https://www.googleapis.com/customsearch/v1"
+            f"?key={self.api_key}"
+            f"&cx={cx_key}&q={encoded_query}&start={start_index}"
+        )
+
+        logger.debug(
+            "Requesting Google CSE page %d, start=%d",
+            page + 1,
+            start_index,
+            extra={
+                "query": self.query,
+                "page": page + 1,
+                "start_index": start_index,
+            },
+        )
+
+        try:
+            async with session.get(url) as resp:
+                if not (200 <= resp.status < 300):
+                    body = await resp.text()
+                    logger.error(
+                        f"Google search: unexpected response status: {resp.status}",
+                        extra={
+                            "status": resp.status,
+                            "url": url,
+                            "query": self.query,
+                            "page": page + 1,
+                            "start_index": start_index,
+                            "body_snippet": body[:300],
+                        },
+                    )
+                    return None
+                search_results = await resp.json()
+                if "error" in search_results:
+                    err = search_results.get("error", {})
+                    logger.error(
+                        "Google CSE API returned error",
+                        extra={
+                            "query": self.query,
+                            "url": url,
+                            "page": page + 1,
+                            "start_index": start_index,
+                            "api_error": err,
+                        },
+                    )
+                    return None
+                return search_results
+        except aiohttp.ClientError as e:
+            logger.exception(
+                f"Google CSE connection error: {e}",
+                extra={
+                    "query": self.query,
+                    "url": url,
+                    "page": page + 1,
+                    "start_index": start_index,
+                },
+            )
+            return None
+        except Exception as e:
+            logger.exception(
+                f"Error retrieving or parsing Google API response: {e}",
+                extra={
+                    "query": self.query,
+                    "url": url,
+                    "page": page + 1,
+                    "start_index": start_index,
+                },
+            )
+            return None
@@ -4,6 +4,8 @@ from typing import Dict, Any, Type, TypeVar
 
 T = TypeVar("T")
 
+_MISSING = object()
+
 
 class ServiceContainer:
     """Service container for dependency injection"""
@@ -17,9 +19,10 @@ class ServiceContainer:
 
     def get_service(self, service_type: Type[T]) -> T:
         """Get a service instance"""
-        if service_type not in self._services:
+        service = self._services.get(service_type, _MISSING)
+        if service is _MISSING:
             raise RuntimeError(f"Service {service_type.__name__} not registered")
-        return self._services[service_type]
+        return service
 
     def has_service(self, service_type: Type[T]) -> bool:
         """Check if a service is registered"""
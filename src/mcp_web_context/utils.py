@@ -1,17 +1,158 @@
 import logging
 import re
-from typing import Any, cast
+from typing import Any, Iterator, Optional, cast
 import bs4
 from bs4 import BeautifulSoup
 import difflib
+from lxml import etree
+from lxml import html as lxml_html
 from urllib.parse import urljoin, urlparse
 from markdownify import MarkdownConverter
 
 
+# Tags whose content is never part of the page's main text
+UNWANTED_TAGS = (
+    "script",
+    "style",
+    "footer",
+    "header",
+    "nav",
+    "menu",
+    "sidebar",
+    "svg",
+    "button",
+)
+
+# Precompiled lookups for the lxml extraction path
+_FIRST_TITLE_XPATH = etree.XPath("(//title)[1]")
+_FIRST_H1_XPATH = etree.XPath("(//h1)[1]")
+_IMG_WITH_SRC_XPATH = etree.XPath("//img[@src]")
+
+# Image classes that suggest a content image rather than chrome
+_RELEVANT_IMAGE_CLASSES = frozenset(
+    ("header", "featured", "hero", "thumbnail", "main", "content")
+)
+
+_HTTP_SCHEMES = ("http://", "https://")
+
+# Subtrees left out of tree text: the unwanted tags, plus template content,
+# which BeautifulSoup's get_text also skips
+_SKIPPED_TEXT_TAGS = frozenset(UNWANTED_TAGS) | {"template"}
+
+# Strip navigation, ads, and other unwanted elements
+_MD_STRIP_BASE = [
+    "nav",
+    "header",
+    "footer",
+    "aside",
+    "script",
+    "style",
+    "svg",
+    "iframe",
+    "form",
+    "button",
+    # strip links
+    "a",
+]
+
+
+def _markdown_converter(strip: list[str]) -> MarkdownConverter:
+    return MarkdownConverter(
+        strip=strip,
+        # Clean heading style
+        heading_style="ATX",  # Use # ## ### instead of underlines
+        escape_asterisks=False,
+        escape_underscores=False,
+    )
+
+
+# Converters keep no per-document state, and reusing them keeps their
+# per-tag conversion function cache warm across pages
+_MD_CONV_WITH_IMG = _markdown_converter(_MD_STRIP_BASE)
+_MD_CONV_NO_IMG = _markdown_converter(_MD_STRIP_BASE + ["img"])
+
+_WHITESPACE_RUN_RE = re.compile(r"\s{2,}")
+
+
 def text_similarity(a, b):
     return difflib.SequenceMatcher(None, a.lower(), b.lower()).ratio()
 
 
+def _title_matcher(page_title: str) -> difflib.SequenceMatcher:
+    """A matcher with the title as its second sequence, so its index is built once.
+
+    SequenceMatcher caches its analysis of seq2; set_seq1 per candidate then
+    gives the same ratio as text_similarity(candidate, page_title).
+    """
+    matcher = difflib.SequenceMatcher(None)
+    matcher.set_seq2(page_title.lower())
+    return matcher
+
+
+def _parse_dimension(value: str) -> float:
+    """Parse dimension value, handling px units"""
+    if value[-2:].lower() == "px":
+        value = value[:-2]  # Remove 'px' suffix
+    try:
+        return float(value)  # Convert to float first to handle decimal values
+    except ValueError:
+        # Values like "100%" or "auto" are common and simply carry no size
+        logging.debug("Unparseable dimension value %r", value)
+        return 0
+
+
+def _score_image(
+    img_classes: list[str],
+    alt_text: str,
+    width: Optional[str],
+    height: Optional[str],
+    title_matcher: difflib.SequenceMatcher,
+) -> Optional[float]:
+    """Score an image's relevance to the page; None means it is too small to keep"""
+    score = 0
+    # Check for relevant classes
+    if not _RELEVANT_IMAGE_CLASSES.isdisjoint(img_classes):
+        score += 2  # Higher score
+
+    # Check for relevant alt text
+    if alt_text:
+        title_matcher.set_seq1(alt_text.lower())
+        similarity = title_matcher.ratio()
+        score += 5 * similarity
+
+    # Check for size attributes
+    if width and height:
+        width_value = _parse_dimension(width)
+        height_value = _parse_dimension(height)
+        if width_value and height_value:
+            if width_value >= 2000 and height_value >= 1000:
+                score += 3  # Medium score (very large images)
+            elif width_value >= 1600 or height_value >= 800:
+                score += 2  # Lower score
+            elif width_value >= 800 or height_value >= 500:
+                score += 1  # Lowest score
+            elif width_value >= 500 or height_value >= 300:
+                score += 0  # Lowest score
+            else:
+                return None  # Skip small images
+
+    return score
+
+
+def _score_upper_bound(
+    img_classes: list[str], alt_text: str, width: Any, height: Any
+) -> float:
+    """Best score _score_image could give, from the attributes alone"""
+    bound = 0.0
+    if not _RELEVANT_IMAGE_CLASSES.isdisjoint(img_classes):
+        bound += 2
+    if alt_text:
+        bound += 5
+    if width and height:
+        bound += 3
+    return bound
+
+
 def get_relevant_images(
     soup: BeautifulSoup,
     url: str,
@@ -33,80 +174,40 @@ def get_relevant_images(
     """
     image_info_list: list[tuple[bs4.Tag, dict]] = []
 
-    relevant_classes = set(
-        (
-            "header",
-            "featured",
-            "hero",
-            "thumbnail",
-            "main",
-            "content",
-        )
-    )
-
-    def parse_dimension(value: str) -> float:
-        """Parse dimension value, handling px units"""
-        if value.lower().endswith("px"):
-            value = value[:-2]  # Remove 'px' suffix
-        try:
-            return float(value)  # Convert to float first to handle decimal values
-        except ValueError as e:
-            print(f"Error parsing dimension value {value}: {e}")
-            return 0
-
     try:
-        # Find all img tags with src attribute
-        all_images = soup.find_all("img", src=True)
+        # Find all img tags with src attribute; a tag-name match only yields Tags
+        all_images = cast(list[bs4.Tag], soup.find_all("img", src=True))
         seen = set()
+        title_matcher = _title_matcher(page_title)
         for img in all_images:
-            if isinstance(img, bs4.Tag):
-                img_src = img.get("src", None)
-            else:
-                continue
-            if img_src is None:
-                continue
-            img_src = str(img_src)
             # urljoin will handle the case when img_src is is_absolute_url
-            img_src = urljoin(url, img_src)
-            if not img_src.startswith(("http://", "https://")):
+            img_src = urljoin(url, str(img["src"]))
+            if not img_src.startswith(_HTTP_SCHEMES):
                 continue
 
             if img_src in seen:
                 continue
             seen.add(img_src)
 
-            score = 0
-            # Check for relevant classes
-
             img_classes = cast(list[str], img.get("class") or [])
+            alt_text = str(img.get("alt") or "")
+            width = img.get("width")
+            height = img.get("height")
+            # Skip scoring for images that cannot reach the threshold
+            if (
+                _score_upper_bound(img_classes, alt_text, width, height)
+                < min_relevance_score
+            ):
+                continue
 
-            if any(img_cls in relevant_classes for img_cls in img_classes):
-                score += 2  # Higher score
-
-            # Check for relevant alt text
-            alt_text = ""
-            if img.get("alt"):
-                alt_text = img["alt"]
-                similarity = text_similarity(alt_text, page_title)
-                score += 5 * similarity
-
-            # Check for size attributes
-            if img.get("width") and img.get("height"):
-                width = parse_dimension(str(img["width"]))
-                height = parse_dimension(str(img["height"]))
-                if width and height:
-                    if width >= 2000 and height >= 1000:
-                        score += 3  # Medium score (very large images)
-                    elif width >= 1600 or height >= 800:
-                        score += 2  # Lower score
-                    elif width >= 800 or height >= 500:
-                        score += 1  # Lowest score
-                    elif width >= 500 or height >= 300:
-                        score += 0  # Lowest score
-                    else:
-                        continue  # Skip small images
-
-            if score < min_relevance_score:
+            score = _score_image(
+                img_classes,
+                alt_text,
+                str(width) if width else None,
+                str(height) if height else None,
+                title_matcher,
+            )
+            if score is None or score < min_relevance_score:
                 continue
 
             image_info_list.append(
@@ -119,11 +220,13 @@ def get_relevant_images(
         )
         sorted_images = sorted_images[:5]  # Return top 5 images
 
-        image_tags_to_keep = {img_info[0] for img_info in sorted_images}
         # Decompose irrelevant images from soup if requested
         if decompose_irrelevant:
+            # By identity: Tag hashes by re-serializing itself and compares equal
+            # to any structurally identical tag
+            image_ids_to_keep = {id(img_info[0]) for img_info in sorted_images}
             for img in all_images:
-                if img not in image_tags_to_keep:
+                if id(img) not in image_ids_to_keep:
                     img.decompose()
 
         return [img_info[1] for img_info in sorted_images]
@@ -135,19 +238,7 @@ def get_relevant_images(
 
 def clean_soup(soup: BeautifulSoup) -> BeautifulSoup:
     """Clean the soup by removing unwanted tags"""
-    for tag in soup.find_all(
-        [
-            "script",
-            "style",
-            "footer",
-            "header",
-            "nav",
-            "menu",
-            "sidebar",
-            "svg",
-            "button",
-        ]
-    ):
+    for tag in soup.find_all(list(UNWANTED_TAGS)):
         tag.decompose()
 
     disallowed_class_set = {"nav", "menu", "sidebar", "footer"}
@@ -182,21 +273,20 @@ def extract_title(soup: BeautifulSoup) -> str:
 def replace_images_with_alt_text(soup: BeautifulSoup) -> BeautifulSoup:
     """Replace img tags with their alt text for better LLM processing"""
     try:
-        for img in soup.find_all("img"):
-            if isinstance(img, bs4.Tag):
-                alt_text = img.get("alt", "")
-                if isinstance(alt_text, str):
-                    alt_text = alt_text.strip()
-                    if alt_text:
-                        # Create a new text node to replace the img tag
-                        replacement_text = soup.new_string(f"[Image: {alt_text}]")
-                        img.replace_with(replacement_text)
-                    else:
-                        # Remove img if no alt text
-                        img.decompose()
+        for img in cast(list[bs4.Tag], soup.find_all("img")):
+            alt_text = img.get("alt", "")
+            if isinstance(alt_text, str):
+                alt_text = alt_text.strip()
+                if alt_text:
+                    # Create a new text node to replace the img tag
+                    replacement_text = soup.new_string(f"[Image: {alt_text}]")
+                    img.replace_with(replacement_text)
                 else:
-                    # Remove img if alt is not a string
+                    # Remove img if no alt text
                     img.decompose()
+            else:
+                # Remove img if alt is not a string
+                img.decompose()
         return soup
     except Exception as e:
         logging.error(f"Error replacing images with alt text: {e}")
@@ -207,44 +297,153 @@ def get_text_from_soup(soup: BeautifulSoup) -> str:
     """Get the relevant text from the soup with improved filtering"""
     text = soup.get_text(strip=True, separator="\n")
     # Remove excess whitespace
-    text = re.sub(r"\s{2,}", " ", text)
+    text = _WHITESPACE_RUN_RE.sub(" ", text)
     return text
 
 
+def _collapse_blank_lines(text: str) -> str:
+    """Limit to max one blank line between content, in a single linear pass
+
+    Same result as re.sub(r"(?:\s*\n\s*){3,}", "\n\n", text).strip(): a
+    whitespace run spanning three or more newlines (two or more blank lines)
+    becomes one blank line, and the whitespace around it goes with it. That
+    regex backtracks quadratically on long whitespace runs.
+    """
+    lines: list[str] = []
+    blanks: list[str] = []
+    for line in text.strip().split("\n"):
+        if not line or line.isspace():
+            blanks.append(line)
+            continue
+        if len(blanks) >= 2:
+            lines[-1] = lines[-1].rstrip()
+            lines.append("")
+            line = line.lstrip()
+        else:
+            # A single blank line is not a collapsible run; keep it verbatim
+            lines.extend(blanks)
+        blanks.clear()
+        lines.append(line)
+    return "\n".join(lines)
+
+
 def get_markdown_from_soup(soup: BeautifulSoup, strip_img=False) -> str:
     """Convert BeautifulSoup to markdown using MarkdownConverter with content cleaning"""
-    # Strip navigation, ads, and other unwanted elements
-    strip = [
-        "nav",
-        "header",
-        "footer",
-        "aside",
-        "script",
-        "style",
-        "svg",
-        "iframe",
-        "form",
-        "button",
-        # strip links
-        "a",
-    ]
-    if strip_img:
-        strip.append("img")
     try:
-        converter = MarkdownConverter(
-            strip=strip,
-            # Clean heading style
-            heading_style="ATX",  # Use # ## ### instead of underlines
-            escape_asterisks=False,
-            escape_underscores=False,
-        )
+        converter = _MD_CONV_NO_IMG if strip_img else _MD_CONV_WITH_IMG
 
         markdown_content = converter.convert_soup(soup)
 
-        # Clean up excessive blank lines - limit to max one blank line between content
-        markdown_content = re.sub(r"(?:\s*\n\s*){3,}", "\n\n", markdown_content)
-
-        return markdown_content.strip()
+        return _collapse_blank_lines(markdown_content)
     except Exception as e:
         logging.error(f"Error converting HTML to markdown: {e}")
         return get_text_from_soup(soup)
+
+
+def parse_html_tree(html: str) -> lxml_html.HtmlElement:
+    """Parse an HTML document into an lxml tree"""
+    try:
+        return lxml_html.document_fromstring(html)
+    except etree.ParserError:
+        # Empty or whitespace-only documents
+        return lxml_html.document_fromstring("<html></html>")
+    except ValueError:
+        # lxml refuses str input with an XML encoding declaration (XHTML);
+        # the text is already decoded, so hand it over as UTF-8 bytes. Parsers
+        # must not be shared between threads, so this one is per call.
+        return lxml_html.document_fromstring(
+            html.encode("utf-8"), parser=lxml_html.HTMLParser(encoding="utf-8")
+        )
+
+
+def extract_title_from_tree(tree: lxml_html.HtmlElement) -> str:
+    """Extract the title from an lxml tree"""
+    title = _FIRST_TITLE_XPATH(tree) or _FIRST_H1_XPATH(tree)
+
+    if not title:
+        return ""
+    else:
+        return title[0].text_content()
+
+
+def get_relevant_images_from_tree(
+    tree: lxml_html.HtmlElement,
+    url: str,
+    page_title: str,
+    min_relevance_score: float = 2.0,
+) -> list[dict[str, Any]]:
+    """Extract relevant images from an lxml tree, scored like get_relevant_images"""
+    image_info_list: list[dict[str, Any]] = []
+
+    try:
+        seen = set()
+        title_matcher = _title_matcher(page_title)
+        for img in _IMG_WITH_SRC_XPATH(tree):
+            # urljoin will handle the case when img_src is is_absolute_url
+            img_src = urljoin(url, img.get("src"))
+            if not img_src.startswith(_HTTP_SCHEMES):
+                continue
+
+            if img_src in seen:
+                continue
+            seen.add(img_src)
+
+            img_classes = (img.get("class") or "").split()
+            alt_text = img.get("alt") or ""
+            width = img.get("width")
+            height = img.get("height")
+            # Skip scoring for images that cannot reach the threshold
+            if (
+                _score_upper_bound(img_classes, alt_text, width, height)
+                < min_relevance_score
+            ):
+                continue
+
+            score = _score_image(
+                img_classes,
+                alt_text,
+                width,
+                height,
+                title_matcher,
+            )
+            if score is None or score < min_relevance_score:
+                continue
+
+            image_info_list.append({"url": img_src, "score": score, "desc": alt_text})
+
+        # Sort images by score (highest first) and return top 5
+        image_info_list.sort(key=lambda x: x["score"], reverse=True)
+        return image_info_list[:5]
+
+    except Exception as e:
+        logging.error(f"Error in get_relevant_images_from_tree: {e}")
+        return []
+
+
+def _iter_tree_text(tree: lxml_html.HtmlElement) -> Iterator[str]:
+    """Yield the tree's text nodes in document order, skipping unwanted subtrees.
+
+    A skipped element's tail is still yielded as its own chunk, so the words
+    on either side of it stay apart, as they do in clean_soup's output.
+    """
+    walker = etree.iterwalk(tree, events=("start", "end", "comment", "pi"))
+    for event, element in walker:
+        if event == "start":
+            if element.tag in _SKIPPED_TEXT_TAGS:
+                walker.skip_subtree()
+            elif element.text:
+                yield element.text
+        elif element.tail and element is not tree:
+            # "end" of an element, or a comment/PI whose own text is not content
+            yield element.tail
+
+
+def get_text_from_tree(tree: lxml_html.HtmlElement) -> str:
+    """Get the text from an lxml tree without unwanted tags, matching
+    get_text_from_soup(clean_soup(soup))"""
+    text = "\n".join(
+        stripped for stripped in (t.strip() for t in _iter_tree_text(tree)) if stripped
+    )
+    # Remove excess whitespace
+    text = _WHITESPACE_RUN_RE.sub(" ", text)
+    return text
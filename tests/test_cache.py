@@ -0,0 +1,28 @@
+import asyncio
+
+import pytest
+
+from src.mcp_web_context.cache import async_cache_result, init_db
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_call():
+    await init_db()
+    calls = 0
+
+    async def compute(value: str) -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return value.upper()
+
+    cached = async_cache_result(
+        argument_serializers={str: str},
+        result_serializer=str,
+        result_deserializer=str,
+    )(compute)
+
+    results = await asyncio.gather(*(cached("coalesce-me") for _ in range(5)))
+
+    assert results == ["COALESCE-ME"] * 5
+    assert calls == 1
@@ -1,3 +1,7 @@
+import shutil
+from pathlib import Path
+from uuid import uuid4
+
 from fastapi.testclient import TestClient
 
 from src.mcp_web_context.main import app
@@ -17,3 +21,152 @@ def test_logs_root_without_trailing_slash():
     assert resp.status_code == 200
     assert "Log Files Browser" in resp.text
 
+
+def test_delete_all_removes_files_and_folders():
+    target = Path("./logs") / f"test-delete-all-{uuid4()}"
+    (target / "nested").mkdir(parents=True)
+    (target / "a.log").write_text("a")
+    (target / "nested" / "b.log").write_text("b")
+
+    try:
+        resp = client.request(
+            "DELETE", "/logs/delete-all", json={"path": f"/logs/{target.name}"}
+        )
+        assert resp.status_code == 200
+        assert resp.json()["message"] == "Deleted 1 files and 1 folders"
+        assert list(target.iterdir()) == []
+    finally:
+        shutil.rmtree(target, ignore_errors=True)
+
+
+def test_delete_refuses_symlink_leading_outside_logs(tmp_path):
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    (outside / "keep.log").write_text("keep")
+    link = Path("./logs") / f"test-symlink-{uuid4()}"
+    link.symlink_to(outside, target_is_directory=True)
+
+    try:
+        resp = client.delete(f"/logs/delete-folder/{link.name}")
+        assert resp.status_code == 400
+        resp = client.delete(f"/logs/delete/{link.name}/keep.log")
+        assert resp.status_code == 400
+        resp = client.request(
+            "DELETE", "/logs/delete-all", json={"path": f"/logs/{link.name}"}
+        )
+        assert resp.status_code == 400
+        assert (outside / "keep.log").exists()
+    finally:
+        link.unlink()
+
+
+def test_large_text_file_renders_only_tail():
+    target = Path("./logs") / f"test-large-{uuid4()}.log"
+    lines = [f"line {i}" for i in range(200_000)]
+    target.write_text("\n".join(lines))
+
+    try:
+        resp = client.get(f"/logs/{target.name}")
+        assert resp.status_code == 200
+        assert "Showing the last 1.0 MB" in resp.text
+        assert lines[-1] in resp.text
+        assert f">{lines[0]}\n" not in resp.text
+    finally:
+        target.unlink(missing_ok=True)
+
+
+def test_logs_listing_is_gzip_compressed():
+    resp = client.get("/logs/", headers={"Accept-Encoding": "gzip"})
+    assert resp.status_code == 200
+    assert resp.headers.get("content-encoding") == "gzip"
+
+
+def test_log_download_is_not_gzip_compressed():
+    target = Path("./logs") / f"test-download-{uuid4()}.log"
+    target.write_text("line\n" * 2000)
+
+    try:
+        resp = client.get(
+            f"/logs/{target.name}?download=1", headers={"Accept-Encoding": "gzip"}
+        )
+        assert resp.status_code == 200
+        assert "content-encoding" not in resp.headers
+        assert resp.headers["accept-ranges"] == "bytes"
+    finally:
+        target.unlink(missing_ok=True)
+
+
+def test_listing_shows_folders_before_files():
+    target = Path("./logs") / f"test-listing-{uuid4()}"
+    (target / "zz-folder").mkdir(parents=True)
+    (target / "aa.log").write_text("hello")
+
+    try:
+        resp = client.get(f"/logs/{target.name}")
+        assert resp.status_code == 200
+        folder_pos = resp.text.index(f'data-filepath="{target.name}/zz-folder"')
+        file_pos = resp.text.index(f'data-filepath="{target.name}/aa.log"')
+        assert folder_pos < file_pos
+        assert "5.0 B" in resp.text
+    finally:
+        shutil.rmtree(target, ignore_errors=True)
+
+
+def test_listing_cache_picks_up_new_entries():
+    target = Path("./logs") / f"test-listing-cache-{uuid4()}"
+    target.mkdir()
+
+    try:
+        first = client.get(f"/logs/{target.name}")
+        assert "new.log" not in first.text
+
+        (target / "new.log").write_text("x")
+        second = client.get(f"/logs/{target.name}")
+        assert f'data-filepath="{target.name}/new.log"' in second.text
+    finally:
+        shutil.rmtree(target, ignore_errors=True)
+
+
+def test_path_traversal_rejected():
+    response = client.get("/logs/..%2F..%2Fetc%2Fpasswd")
+    assert response.status_code == 400
+
+    response = client.delete("/logs/delete/..%2Fpyproject.toml")
+    assert response.status_code == 400
+    assert Path("pyproject.toml").exists()
+
+
+def test_file_download_conditional_request():
+    target = Path("./logs") / f"test-etag-{uuid4()}.bin"
+    target.write_bytes(b"\x00\x01\x02")
+
+    try:
+        first = client.get(f"/logs/{target.name}?download=1")
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+        assert etag.startswith('W/"')
+
+        second = client.get(
+            f"/logs/{target.name}?download=1", headers={"If-None-Match": etag}
+        )
+        assert second.status_code == 304
+    finally:
+        target.unlink(missing_ok=True)
+
+
+def test_large_listing_is_streamed(monkeypatch):
+    from src.mcp_web_context.routers import logs
+
+    target = Path("./logs") / f"test-listing-stream-{uuid4()}"
+    target.mkdir()
+    (target / "entry.log").write_text("x")
+    monkeypatch.setattr(logs, "LISTING_STREAM_MIN_DIR_SIZE", -1)
+
+    try:
+        response = client.get(f"/logs/{target.name}")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/html")
+        assert "content-length" not in response.headers
+        assert f'data-filepath="{target.name}/entry.log"' in response.text
+    finally:
+        shutil.rmtree(target, ignore_errors=True)
@@ -0,0 +1,116 @@
+import asyncio
+import os
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from src.mcp_web_context import scraper
+from src.mcp_web_context.scraper import AdmissionLimiter, Scraper, TokenBucket
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_allows_burst_then_throttles():
+    bucket = TokenBucket(rate=20.0, capacity=2)
+
+    start = time.monotonic()
+    await asyncio.gather(bucket.acquire(), bucket.acquire())
+    assert time.monotonic() - start < 0.03
+
+    await asyncio.gather(bucket.acquire(), bucket.acquire())
+    # Two tokens of debt at 20/s take ~0.1s to pay off
+    assert time.monotonic() - start >= 0.09
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_reports_full_after_refill():
+    bucket = TokenBucket(rate=50.0, capacity=1)
+    loop = asyncio.get_running_loop()
+    assert bucket.is_full(loop.time())
+
+    await bucket.acquire()
+    assert not bucket.is_full(loop.time())
+    assert bucket.is_full(loop.time() + 0.05)
+
+
+@pytest.mark.asyncio
+async def test_admission_limiter_admits_waiters_when_limit_is_raised():
+    limiter = AdmissionLimiter(1)
+    admitted = []
+
+    async def enter(name):
+        async with limiter:
+            admitted.append(name)
+            await asyncio.sleep(0.05)
+
+    tasks = [asyncio.create_task(enter(n)) for n in ("a", "b", "c")]
+    await asyncio.sleep(0.01)
+    assert admitted == ["a"]
+
+    await limiter.set_limit(3)
+    await asyncio.sleep(0.01)
+    assert sorted(admitted) == ["a", "b", "c"]
+
+    await asyncio.gather(*tasks)
+    assert limiter.active == 0
+
+
+@pytest.mark.asyncio
+async def test_admission_limiter_release_survives_cancellation():
+    limiter = AdmissionLimiter(1)
+    await limiter.__aenter__()
+    waiter = asyncio.create_task(limiter.__aenter__())
+    await asyncio.sleep(0)
+
+    # Cancel the release while it waits for the condition's lock
+    async with limiter._cond:
+        release = asyncio.create_task(limiter.__aexit__(None, None, None))
+        await asyncio.sleep(0)
+        release.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await release
+
+    await asyncio.wait_for(waiter, timeout=1)
+    assert limiter.active == 1
+
+
+@pytest.mark.asyncio
+async def test_markdown_pool_is_replaced_after_a_worker_dies():
+    broken = scraper._get_markdown_pool()
+    with pytest.raises(BrokenProcessPool):
+        broken.submit(os._exit, 1).result()
+
+    try:
+        content, _, title = await Scraper._parse_html_async(
+            "<html><head><title>T</title></head><body><p>Hello</p></body></html>",
+            "https://example.com/",
+            "markdown",
+        )
+        assert "Hello" in content and title == "T"
+        assert scraper._markdown_pool is not broken
+    finally:
+        if scraper._markdown_pool is not None:
+            scraper._markdown_pool.shutdown(cancel_futures=True)
+            scraper._markdown_pool = None
+
+
+@pytest.mark.asyncio
+async def test_pdf_pool_is_replaced_after_a_worker_dies():
+    import pymupdf
+
+    doc = pymupdf.open()
+    doc.new_page().insert_text((72, 72), "Hello PDF")
+    pdf_bytes = doc.tobytes()
+
+    broken = scraper._get_pdf_pool()
+    with pytest.raises(BrokenProcessPool):
+        broken.submit(os._exit, 1).result()
+
+    try:
+        content, _ = await scraper._convert_pdf(pdf_bytes)
+        assert "Hello PDF" in content
+        assert scraper._pdf_pool is not broken
+    finally:
+        if scraper._pdf_pool is not None:
+            scraper._pdf_pool.shutdown(cancel_futures=True)
+            scraper._pdf_pool = None
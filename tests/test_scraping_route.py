@@ -0,0 +1,25 @@
+import asyncio
+
+import pytest
+
+from src.mcp_web_context.routers import scraping
+
+
+@pytest.mark.asyncio
+async def test_host_slot_forgets_idle_hosts():
+    entered = asyncio.Event()
+    release = asyncio.Event()
+
+    async def hold():
+        async with scraping._host_slot("https://example.com/a"):
+            entered.set()
+            await release.wait()
+
+    task = asyncio.create_task(hold())
+    await entered.wait()
+    assert "example.com" in scraping._host_semaphores
+
+    release.set()
+    await task
+    assert "example.com" not in scraping._host_semaphores
+    assert "example.com" not in scraping._host_users
@@ -0,0 +1,114 @@
+from bs4 import BeautifulSoup
+
+from src.mcp_web_context.utils import (
+    _collapse_blank_lines,
+    clean_soup,
+    extract_title,
+    extract_title_from_tree,
+    get_markdown_from_soup,
+    get_relevant_images,
+    get_relevant_images_from_tree,
+    get_text_from_soup,
+    get_text_from_tree,
+    parse_html_tree,
+)
+
+PAGE = """
+<html>
+<head><title>Mountain Lake Guide</title><style>p { color: red; }</style></head>
+<body>
+  <nav>Home | About</nav>
+  <h1>Mountain   Lake</h1>
+  <p>Visit the <b>lake</b> in   summer. <!-- hidden --></p>
+  <img src="/hero.jpg" class="hero main" alt="Mountain lake at dawn" width="1800" height="900">
+  <img src="/icon.png" width="16" height="16" alt="icon">
+  <img src="data:image/png;base64,AAAA" alt="inline">
+  <script>var tracking = true;</script>
+  <footer>Copyright</footer>
+  Trailing text
+</body>
+</html>
+"""
+
+
+def test_tree_helpers_match_soup_helpers():
+    soup = BeautifulSoup(PAGE, "lxml")
+    tree = parse_html_tree(PAGE)
+
+    title = extract_title(soup)
+    assert extract_title_from_tree(tree) == title
+    assert get_relevant_images_from_tree(tree, "https://example.com/a", title) == (
+        get_relevant_images(soup, "https://example.com/a", title)
+    )
+    assert get_text_from_tree(tree) == get_text_from_soup(clean_soup(soup))
+
+
+def test_tree_text_keeps_words_apart_around_removed_tags():
+    html = (
+        "<p>foo<nav>n</nav>bar</p><p>hello<sidebar>s</sidebar>world</p>"
+        "<p>a<script>x()</script>b<!-- c -->d<template>t</template>e</p>"
+    )
+    soup = BeautifulSoup(html, "lxml")
+    tree = parse_html_tree(html)
+
+    text = get_text_from_tree(tree)
+    assert text == get_text_from_soup(clean_soup(soup))
+    assert text.split("\n") == ["foo", "bar", "hello", "world", "a", "b", "d", "e"]
+
+
+def test_parse_html_tree_handles_empty_document():
+    tree = parse_html_tree("   ")
+    assert extract_title_from_tree(tree) == ""
+    assert get_text_from_tree(tree) == ""
+
+
+def test_parse_html_tree_handles_xml_declaration():
+    html = (
+        '<?xml version="1.0" encoding="iso-8859-1"?>'
+        '<html xmlns="http://www.w3.org/1999/xhtml">'
+        "<head><title>Café</title></head><body><p>Menu</p></body></html>"
+    )
+    tree = parse_html_tree(html)
+    assert extract_title_from_tree(tree) == "Café"
+    assert "Menu" in get_text_from_tree(tree)
+
+
+def test_duplicate_src_keeps_first_occurrence_even_when_it_scores_low():
+    html = (
+        '<img src="/a.jpg">'
+        '<img src="/a.jpg" class="hero" alt="Lake" width="2000" height="1000">'
+    )
+    soup = BeautifulSoup(html, "lxml")
+    tree = parse_html_tree(html)
+
+    assert get_relevant_images(soup, "https://example.com/", "Lake") == []
+    assert get_relevant_images_from_tree(tree, "https://example.com/", "Lake") == []
+
+
+def test_decompose_irrelevant_removes_duplicate_of_kept_image():
+    html = '<img src="/a.jpg" class="hero"><p>x</p><img src="/a.jpg" class="hero">'
+    soup = BeautifulSoup(html, "lxml")
+
+    images = get_relevant_images(
+        soup, "https://example.com/", "", decompose_irrelevant=True
+    )
+
+    assert [img["url"] for img in images] == ["https://example.com/a.jpg"]
+    assert len(soup.find_all("img")) == 1
+
+
+def test_markdown_collapses_blank_line_runs():
+    html = "<h1>Title</h1>" + "<p></p>" * 5 + "<p>One</p>" + "<br>" * 4 + "<p>Two</p>"
+    soup = BeautifulSoup(html, "lxml")
+
+    assert "\n\n\n" not in get_markdown_from_soup(soup)
+    assert get_markdown_from_soup(soup).startswith("# Title\n\nOne")
+
+
+def test_collapse_blank_lines_matches_regex_cleanup():
+    # Runs of 3+ newlines collapse with the whitespace around them
+    assert _collapse_blank_lines("a\n  \n\n  b\n\n\nc") == "a\n\nb\n\nc"
+    assert _collapse_blank_lines("  a  \n\t\n \n    b  ") == "a\n\nb"
+    # A single blank line, whitespace-only or not, and indentation stay as is
+    assert _collapse_blank_lines("a\n  \nb") == "a\n  \nb"
+    assert _collapse_blank_lines("a\n    b\n\n  c") == "a\n    b\n\n  c"